@@ -1,7 +1,7 @@
 import requests
+from requests.adapters import HTTPAdapter
 import wave
 import numpy as np
-import sounddevice as sd
 import time
 import logging
 
@@ -9,8 +9,15 @@ import logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 复用连接池，避免每次请求重新建立 TCP 连接
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def record_audio(duration=5, sample_rate=16000):
     """录制音频"""
+    # 延迟导入：sounddevice 会初始化 PortAudio，开销大且无声卡环境会失败
+    import sounddevice as sd
+
     logger.info(f"开始录音 {duration} 秒...")
     audio = sd.rec(int(duration * sample_rate), 
                   samplerate=sample_rate, 
@@ -21,10 +28,13 @@ def record_audio(duration=5, sample_rate=16000):
     return audio
 
 def save_wav(audio, filename, sample_rate=16000):
-    """保存为 WAV 文件"""
-    # 将 float32 转换为 int16
-    audio = (audio * 32767).astype(np.int16)
-    
+    """保存为 WAV 文件（注意：会就地缩放传入的 float32 数组）"""
+    # float32 -> int16：就地乘、四舍五入并裁剪，避免额外的全量中间数组和截断偏差
+    np.multiply(audio, 32767.0, out=audio)
+    np.rint(audio, out=audio)
+    np.clip(audio, -32768, 32767, out=audio)
+    audio = audio.astype(np.int16)
+
     with wave.open(filename, 'wb') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)  # 2 bytes for int16
@@ -35,13 +45,14 @@ def save_wav(audio, filename, sample_rate=16000):
 
 def test_vad_service(audio_file):
     """测试 VAD 服务"""
-    url = "http://127.0.0.1:8000/detect"
-    
+    url = "http://127.0.0.1:8000/detect_raw"
+
     try:
+        # 直接以文件句柄作为请求体流式上传，避免整文件先读入内存
         with open(audio_file, 'rb') as f:
-            files = {'audio_file': f}
-            response = requests.post(url, files=files)
-            
+            response = SESSION.post(url, data=f,
+                                    headers={'Content-Type': 'audio/wav'})
+
         if response.status_code == 200:
             result = response.json()
             logger.info("VAD 检测结果:")
@@ -1,7 +1,7 @@
 import requests
+from requests.adapters import HTTPAdapter
 import wave
 import numpy as np
-import sounddevice as sd
 import time
 import logging
 import json
@@ -12,11 +12,15 @@ logger = logging.getLogger(__name__)
 
 BASE_URL = "http://127.0.0.1:8000"
 
+# 复用连接池，避免每次请求重新建立 TCP 连接
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=8))
+
 def test_service_status():
     """测试服务状态"""
     logger.info("=== 测试服务状态 ===")
     try:
-        response = requests.get(f"{BASE_URL}/")
+        response = SESSION.get(f"{BASE_URL}/")
         if response.status_code == 200:
             data = response.json()
             logger.info(f"服务状态: {json.dumps(data, indent=2, ensure_ascii=False)}")
@@ -32,7 +36,7 @@ def test_health_check():
     """测试健康检查"""
     logger.info("=== 测试健康检查 ===")
     try:
-        response = requests.get(f"{BASE_URL}/health")
+        response = SESSION.get(f"{BASE_URL}/health")
         if response.status_code == 200:
             data = response.json()
             logger.info(f"健康状态: {json.dumps(data, indent=2, ensure_ascii=False)}")
@@ -48,7 +52,7 @@ def test_model_info():
     """测试模型信息"""
     logger.info("=== 测试模型信息 ===")
     try:
-        response = requests.get(f"{BASE_URL}/info")
+        response = SESSION.get(f"{BASE_URL}/info")
         if response.status_code == 200:
             data = response.json()
             logger.info(f"模型信息: {json.dumps(data, indent=2, ensure_ascii=False)}")
@@ -62,6 +66,9 @@ def test_model_info():
 
 def record_audio(duration=5, sample_rate=16000):
     """录制音频"""
+    # 延迟导入：sounddevice 会初始化 PortAudio，开销大且无声卡环境会失败
+    import sounddevice as sd
+
     logger.info(f"开始录音 {duration} 秒...")
     audio = sd.rec(int(duration * sample_rate), 
                   samplerate=sample_rate, 
@@ -72,10 +79,24 @@ def record_audio(duration=5, sample_rate=16000):
     return audio
 
 def save_wav(audio, filename, sample_rate=16000):
-    """保存为 WAV 文件"""
-    # 将 float32 转换为 int16
-    audio = (audio * 32767).astype(np.int16)
-    
+    """保存为 WAV 文件（注意：会就地缩放传入的 float32 数组）"""
+    # 服务端统一按 16kHz 处理；非 16kHz 录音在客户端先重采样一次，
+    # 省掉之后每次上传时服务端的重采样开销
+    if sample_rate != 16000:
+        import torch
+        import torchaudio
+        audio = torchaudio.functional.resample(
+            torch.from_numpy(audio.reshape(-1)), sample_rate, 16000,
+            lowpass_filter_width=16,
+            resampling_method="sinc_interp_kaiser").numpy()
+        sample_rate = 16000
+
+    # float32 -> int16：就地乘、四舍五入并裁剪，避免额外的全量中间数组和截断偏差
+    np.multiply(audio, 32767.0, out=audio)
+    np.rint(audio, out=audio)
+    np.clip(audio, -32768, 32767, out=audio)
+    audio = audio.astype(np.int16)
+
     with wave.open(filename, 'wb') as wf:
         wf.setnchannels(1)
         wf.setsampwidth(2)  # 2 bytes for int16
@@ -84,16 +105,25 @@ def save_wav(audio, filename, sample_rate=16000):
     
     logger.info(f"音频已保存到 {filename}")
 
-def test_vad_detection(audio_file, threshold=0.5):
-    """测试 VAD 检测"""
+def test_vad_detection(audio_file, threshold=0.5, audio_bytes=None):
+    """测试 VAD 检测
+
+    audio_bytes 不为 None 时直接上传内存中的字节，避免重复读盘。
+    """
     logger.info(f"=== 测试 VAD 检测 (threshold={threshold}) ===")
-    
+
     try:
-        with open(audio_file, 'rb') as f:
-            files = {'audio_file': f}
-            params = {'threshold': threshold}
-            response = requests.post(f"{BASE_URL}/detect", files=files, params=params)
-            
+        params = {'threshold': threshold}
+        headers = {'Content-Type': 'audio/wav'}
+        if audio_bytes is not None:
+            response = SESSION.post(f"{BASE_URL}/detect_raw", data=audio_bytes,
+                                    params=params, headers=headers)
+        else:
+            # 直接以文件句柄作为请求体流式上传，避免整文件先读入内存
+            with open(audio_file, 'rb') as f:
+                response = SESSION.post(f"{BASE_URL}/detect_raw", data=f,
+                                        params=params, headers=headers)
+
         if response.status_code == 200:
             result = response.json()
             logger.info("VAD 检测结果:")
@@ -128,9 +158,13 @@ def test_different_thresholds(audio_file):
     """测试不同阈值的效果"""
     logger.info("=== 测试不同阈值效果 ===")
     thresholds = [0.3, 0.5, 0.7]
-    
+
+    # 文件只读一次，循环中复用内存里的字节
+    with open(audio_file, 'rb') as f:
+        audio_bytes = f.read()
+
     for threshold in thresholds:
-        result = test_vad_detection(audio_file, threshold)
+        result = test_vad_detection(audio_file, threshold, audio_bytes=audio_bytes)
         if result:
             stats = result['statistics']
             logger.info(f"阈值 {threshold}: 检测到 {stats['total_segments']} 个片段，语音占比 {stats['speech_ratio']*100:.1f}%")
@@ -1,15 +1,44 @@
 import torch
 import torchaudio
 import numpy as np
-from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi import FastAPI, Request, UploadFile, File, HTTPException, Query
 from fastapi.responses import JSONResponse
 import uvicorn
+
+# orjson 原生支持 numpy 标量且序列化速度远快于标准库 json
+try:
+    import orjson  # noqa: F401
+    from fastapi.responses import ORJSONResponse as VADResponse
+except ImportError:
+    VADResponse = JSONResponse
+import asyncio
+import glob
+import hashlib
 import io
 import logging
-import tempfile
 import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+# VAD_LAZY_LOAD=1 时跳过启动预加载，模型在首次请求时加载（加载后常驻内存）
+VAD_LAZY_LOAD = os.environ.get("VAD_LAZY_LOAD", "0") == "1"
+
+# VAD_USE_ONNX=1 时优先使用 ONNX Runtime 后端（仅 CPU 路径），失败回退 JIT
+VAD_USE_ONNX = os.environ.get("VAD_USE_ONNX", "1") == "1"
+# VAD_INT8=1 时对 ONNX 模型做动态 int8 量化（概率有微小偏差，换取约 2 倍吞吐）
+VAD_INT8 = os.environ.get("VAD_INT8", "0") == "1"
+# VAD_TORCH_COMPILE=1 时用 torch.compile 编译前向（仅 torch 后端生效）
+VAD_TORCH_COMPILE = os.environ.get("VAD_TORCH_COMPILE", "0") == "1"
+
+# 动态批处理配置：VAD_BATCHING=0 可关闭，退回单请求推理
+VAD_BATCHING = os.environ.get("VAD_BATCHING", "1") == "1"
+VAD_BATCH_SIZE = int(os.environ.get("VAD_BATCH_SIZE", "8"))
+VAD_MAX_WAIT_MS = int(os.environ.get("VAD_MAX_WAIT_MS", "50"))
+
+# 帧级概率的 LRU 缓存条数（按音频内容哈希命中时只需重做阈值后处理）
+VAD_CACHE_SIZE = int(os.environ.get("VAD_CACHE_SIZE", "64"))
+
 # 配置日志
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -24,18 +53,135 @@ app = FastAPI(
 model = None
 utils = None
 model_loaded = False
+# 推理设备，load_model 时若有 CUDA 则切换到 GPU
+_device = "cpu"
+# torch.compile 后的前向入口；为 None 时直接用 model.audio_forward
+_compiled_forward = None
+
+# VAD 统一使用 16kHz；按原始采样率缓存 Resample 实例，避免每个请求重建 FIR 滤波核
+TARGET_SAMPLE_RATE = 16000
+# Silero 在 16kHz 下的帧长（样本数）
+WINDOW_SIZE = 512
+_resamplers: dict = {}
+
+# 批处理队列，元素为 (waveform, future)；由 startup 钩子创建
+_batch_queue: Optional[asyncio.Queue] = None
+
+# 内容哈希 -> (帧级概率, 样本数) 的 LRU 缓存；概率只依赖音频本身，
+# 同一文件换阈值重查时可跳过解码和模型前向
+_probs_cache: OrderedDict = OrderedDict()
+
+def _probs_cache_get(key):
+    cached = _probs_cache.get(key)
+    if cached is not None:
+        _probs_cache.move_to_end(key)
+    return cached
+
+def _probs_cache_put(key, value):
+    _probs_cache[key] = value
+    _probs_cache.move_to_end(key)
+    while len(_probs_cache) > VAD_CACHE_SIZE:
+        _probs_cache.popitem(last=False)
+
+def resample_to_target(waveform, sample_rate):
+    """将任意采样率的波形重采样到 16kHz（Resample 实例按采样率缓存复用）"""
+    if sample_rate == TARGET_SAMPLE_RATE:
+        return waveform
+    resampler = _resamplers.get(sample_rate)
+    if resampler is None:
+        resampler = torchaudio.transforms.Resample(
+            sample_rate,
+            TARGET_SAMPLE_RATE,
+            lowpass_filter_width=16,
+            resampling_method="sinc_interp_kaiser",
+        )
+        _resamplers[sample_rate] = resampler
+    return resampler(waveform)
+
+def _load_onnx_model():
+    """加载 ONNX 版 Silero 模型，并把 ORT 会话换成多线程配置
+
+    上游 OnnxWrapper 的会话固定 intra_op=1，单请求吃不满 CPU；
+    这里重建 InferenceSession，intra_op 跑满核心、inter_op 置 1。
+    """
+    import onnxruntime
+
+    onnx_model, onnx_utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
+                                            model='silero_vad',
+                                            force_reload=False,
+                                            onnx=True)
+    try:
+        pattern = os.path.join(torch.hub.get_dir(), 'snakers4_silero-vad_master',
+                               '**', 'silero_vad.onnx')
+        paths = glob.glob(pattern, recursive=True)
+        if paths and VAD_INT8:
+            paths[0] = _quantize_onnx_model(paths[0])
+        if paths:
+            opts = onnxruntime.SessionOptions()
+            opts.intra_op_num_threads = os.cpu_count() or 1
+            opts.inter_op_num_threads = 1
+            opts.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            onnx_model.session = onnxruntime.InferenceSession(
+                paths[0], sess_options=opts, providers=['CPUExecutionProvider'])
+    except Exception as e:
+        logger.warning(f"配置 ONNX 多线程会话失败，使用默认会话: {e}")
+    return onnx_model, onnx_utils
+
+def _quantize_onnx_model(fp32_path):
+    """对 ONNX 模型做一次性动态 int8 量化，量化结果缓存在模型文件旁边
+
+    x86 上 ORT 的 int8 kernel 走 VNNI 点积，权重字节减半；
+    量化失败时返回原 FP32 模型路径。
+    """
+    int8_path = fp32_path.replace('.onnx', '_int8.onnx')
+    if os.path.exists(int8_path):
+        return int8_path
+    try:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        logger.info("开始动态量化 ONNX 模型到 int8...")
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QUInt8)
+        logger.info(f"量化完成: {int8_path}")
+        return int8_path
+    except Exception as e:
+        logger.warning(f"int8 量化失败，继续使用 FP32 模型: {e}")
+        return fp32_path
 
 def load_model():
-    """延迟加载 Silero VAD 模型"""
-    global model, utils, model_loaded
+    """加载 Silero VAD 模型（只加载一次，之后常驻内存）"""
+    global model, utils, model_loaded, _device
     if model_loaded:
         return True
-    
+
+    # 纯推理服务，全局关闭梯度跟踪；限制 torch 线程数避免与 ORT/工作线程过度抢核
+    torch.set_grad_enabled(False)
+    torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # 并行工作已启动后不允许再修改，忽略即可
+        pass
+
+    # CPU 环境优先使用 ONNX Runtime，小模型上比 torch JIT 更快
+    if VAD_USE_ONNX and not torch.cuda.is_available():
+        try:
+            model, utils = _load_onnx_model()
+            model_loaded = True
+            logger.info("VAD 模型加载成功 (ONNX Runtime)")
+            return True
+        except Exception as e:
+            logger.warning(f"ONNX 模型加载失败，回退到 JIT: {e}")
+
     try:
         logger.info("开始加载 Silero VAD 模型...")
         model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
                                     model='silero_vad',
                                     force_reload=False)
+        if torch.cuda.is_available():
+            _device = "cuda"
+            model = model.to(_device).eval()
+            logger.info("检测到 CUDA，模型已迁移到 GPU")
+        if VAD_TORCH_COMPILE:
+            _try_compile_forward()
         model_loaded = True
         logger.info("VAD 模型加载成功")
         return True
@@ -43,6 +189,180 @@ def load_model():
         logger.error(f"VAD 模型加载失败: {e}")
         return False
 
+@app.on_event("startup")
+async def preload_model():
+    """服务启动时预加载模型，避免首个请求承担数秒的冷启动开销"""
+    # 解码/推理通过 to_thread 下放的线程池，限制大小避免过度并行
+    loop = asyncio.get_event_loop()
+    loop.set_default_executor(
+        ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)))
+    if VAD_LAZY_LOAD:
+        logger.info("VAD_LAZY_LOAD=1，跳过启动预加载，模型将在首次请求时加载")
+        return
+    load_model()
+
+@app.on_event("startup")
+async def start_batch_worker():
+    """启动动态批处理协程，把并发请求聚合成一次模型前向"""
+    global _batch_queue
+    if not VAD_BATCHING:
+        logger.info("VAD_BATCHING=0，批处理已关闭，使用单请求推理")
+        return
+    _batch_queue = asyncio.Queue()
+    asyncio.get_event_loop().create_task(_batch_worker())
+    logger.info(f"批处理已启用: batch_size={VAD_BATCH_SIZE}, max_wait={VAD_MAX_WAIT_MS}ms")
+
+def _bucket_by_length(items):
+    """按音频时长分桶（<10s / 10-30s / >30s），减少 padding 浪费"""
+    buckets = {}
+    for item in items:
+        num_samples = item[0].shape[0]
+        if num_samples < 10 * TARGET_SAMPLE_RATE:
+            key = 0
+        elif num_samples <= 30 * TARGET_SAMPLE_RATE:
+            key = 1
+        else:
+            key = 2
+        buckets.setdefault(key, []).append(item)
+    return buckets.values()
+
+def _try_compile_forward():
+    """用 torch.compile 编译 audio_forward，并在启动时预热一次
+
+    编译成本在预加载阶段支付；编译或预热失败时保持未编译路径。
+    """
+    global _compiled_forward
+    try:
+        compiled = torch.compile(model.audio_forward, mode="reduce-overhead")
+        with torch.inference_mode():
+            compiled(_to_device(torch.zeros(1, WINDOW_SIZE)), TARGET_SAMPLE_RATE)
+        _compiled_forward = compiled
+        logger.info("torch.compile 已启用")
+    except Exception as e:
+        logger.warning(f"torch.compile 失败，使用未编译前向: {e}")
+
+def _to_device(waveform):
+    """必要时把波形搬到推理设备；GPU 路径用锁页内存做异步拷贝"""
+    if _device == "cpu":
+        return waveform
+    return waveform.pin_memory().to(_device, non_blocking=True)
+
+def _forward_batch(waveforms):
+    """把若干 1-D 波形 pad 成 (B, T) 后做一次前向，返回 (B, num_frames) 的语音概率"""
+    padded = _to_device(torch.nn.utils.rnn.pad_sequence(waveforms, batch_first=True))
+    forward = _compiled_forward if _compiled_forward is not None else model.audio_forward
+    with torch.inference_mode():
+        return forward(padded, TARGET_SAMPLE_RATE).cpu()
+
+async def _batch_worker():
+    """后台协程：积攒最多 VAD_BATCH_SIZE 个请求或等待 VAD_MAX_WAIT_MS，批量推理"""
+    loop = asyncio.get_event_loop()
+    while True:
+        batch = [await _batch_queue.get()]
+        deadline = loop.time() + VAD_MAX_WAIT_MS / 1000.0
+        while len(batch) < VAD_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_batch_queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        for bucket in _bucket_by_length(batch):
+            waveforms = [item[0] for item in bucket]
+            try:
+                probs = await asyncio.to_thread(_forward_batch, waveforms)
+            except Exception as e:
+                for _, future in bucket:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for i, (waveform, future) in enumerate(bucket):
+                # 去掉 padding 对应的帧，只保留该条音频自身的概率序列
+                num_frames = (waveform.shape[0] + WINDOW_SIZE - 1) // WINDOW_SIZE
+                if not future.done():
+                    future.set_result(probs[i, :num_frames])
+
+def _segment_core(probs, audio_length_samples, threshold,
+                  min_speech_samples, min_silence_samples):
+    """逐帧迟滞状态机，返回 (N, 2) 的 [start, end]（样本数）
+
+    纯标量整型/浮点运算，便于 numba 将其编译为原生循环。
+    """
+    segments = np.empty((len(probs) // 2 + 1, 2), dtype=np.int64)
+    count = 0
+    neg_threshold = max(threshold - 0.15, 0.01)
+    triggered = False
+    start = 0
+    temp_end = 0
+
+    for i in range(len(probs)):
+        prob = probs[i]
+        if prob >= threshold and temp_end != 0:
+            temp_end = 0
+        if prob >= threshold and not triggered:
+            triggered = True
+            start = WINDOW_SIZE * i
+            continue
+        if prob < neg_threshold and triggered:
+            if temp_end == 0:
+                temp_end = WINDOW_SIZE * i
+            if WINDOW_SIZE * i - temp_end < min_silence_samples:
+                continue
+            if temp_end - start > min_speech_samples:
+                segments[count, 0] = start
+                segments[count, 1] = temp_end
+                count += 1
+            temp_end = 0
+            triggered = False
+
+    if triggered and audio_length_samples - start > min_speech_samples:
+        segments[count, 0] = start
+        segments[count, 1] = audio_length_samples
+        count += 1
+
+    return segments[:count]
+
+try:
+    from numba import njit
+    _segment_core = njit(cache=True)(_segment_core)
+    # 导入时预热，JIT 编译成本只在进程启动时付一次
+    _segment_core(np.zeros(1, dtype=np.float32), 0, 0.5, 0.0, 0.0)
+except ImportError:
+    # numba 未安装时退回纯 Python 实现
+    pass
+
+def probs_to_timestamps(speech_probs, audio_length_samples, threshold,
+                        min_speech_duration_ms, min_silence_duration_ms,
+                        speech_pad_ms=30):
+    """将帧级语音概率转换为 {start, end} 时间戳（样本数），语义对齐 get_speech_timestamps"""
+    speech_probs = np.ascontiguousarray(speech_probs, dtype=np.float32)
+    min_speech_samples = TARGET_SAMPLE_RATE * min_speech_duration_ms / 1000
+    min_silence_samples = TARGET_SAMPLE_RATE * min_silence_duration_ms / 1000
+    speech_pad_samples = TARGET_SAMPLE_RATE * speech_pad_ms // 1000
+
+    segments = _segment_core(speech_probs, int(audio_length_samples),
+                             float(threshold), min_speech_samples, min_silence_samples)
+    speeches = [{'start': int(s), 'end': int(e)} for s, e in segments]
+
+    # 片段前后各补 speech_pad_ms，相邻片段间隙不足时平分
+    for i, speech in enumerate(speeches):
+        if i == 0:
+            speech['start'] = int(max(0, speech['start'] - speech_pad_samples))
+        if i != len(speeches) - 1:
+            silence = speeches[i + 1]['start'] - speech['end']
+            if silence < 2 * speech_pad_samples:
+                speech['end'] += silence // 2
+                speeches[i + 1]['start'] = max(0, speeches[i + 1]['start'] - silence // 2)
+            else:
+                speech['end'] = int(min(audio_length_samples, speech['end'] + speech_pad_samples))
+                speeches[i + 1]['start'] = int(max(0, speeches[i + 1]['start'] - speech_pad_samples))
+        else:
+            speech['end'] = int(min(audio_length_samples, speech['end'] + speech_pad_samples))
+
+    return speeches
+
 @app.get("/")
 async def root():
     """根路径 - 服务状态检查"""
@@ -72,105 +392,173 @@ async def detect_speech(
     audio_file: UploadFile = File(...),
     threshold: Optional[float] = Query(0.5, ge=0.0, le=1.0, description="语音检测阈值 (0.0-1.0)"),
     min_speech_duration_ms: Optional[int] = Query(250, ge=0, description="最小语音持续时间(毫秒)"),
-    min_silence_duration_ms: Optional[int] = Query(100, ge=0, description="最小静音持续时间(毫秒)")
+    min_silence_duration_ms: Optional[int] = Query(100, ge=0, description="最小静音持续时间(毫秒)"),
+    format: Optional[str] = Query("aos", description="返回格式：aos=片段字典列表，soa=列式数组")
 ):
     """
     检测音频中的语音活动
-    
+
     Args:
         audio_file: 上传的音频文件（WAV格式）
         threshold: 语音检测阈值，默认0.5
         min_speech_duration_ms: 最小语音持续时间(毫秒)，默认250ms
         min_silence_duration_ms: 最小静音持续时间(毫秒)，默认100ms
-    
+        format: 返回格式，aos（默认）或 soa
+
     Returns:
         JSON 包含语音活动的时间戳列表
     """
-    temp_path = None
     try:
-        # 延迟加载模型
+        # 通常模型已在启动时预加载；VAD_LAZY_LOAD 模式下在此兜底加载
         if not load_model():
             raise HTTPException(status_code=503, detail="模型加载失败")
-        
+
         # 验证文件类型
         if not audio_file.filename.lower().endswith(('.wav', '.mp3', '.flac')):
             raise HTTPException(status_code=400, detail="只支持 WAV, MP3, FLAC 格式的音频文件")
-        
+
         logger.info(f"接收到音频文件: {audio_file.filename}")
-        
+
         # 读取音频文件
         contents = await audio_file.read()
-        logger.info(f"音频文件大小: {len(contents)} bytes")
-        
-        if len(contents) == 0:
-            raise HTTPException(status_code=400, detail="音频文件为空")
-        
-        # 将音频内容保存到临时文件
-        suffix = os.path.splitext(audio_file.filename)[1] or '.wav'
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_file.write(contents)
-            temp_path = temp_file.name
-        
-        logger.info("开始处理音频...")
-        
-        # 用 torchaudio 读取音频文件
-        waveform, sample_rate = torchaudio.load(temp_path)
-        logger.info(f"音频参数: sample_rate={sample_rate}, shape={waveform.shape}, duration={waveform.shape[1]/sample_rate:.2f}s")
-        
-        # 获取语音活动时间戳
-        speech_timestamps = utils[0](
-            waveform, 
-            model, 
-            threshold=threshold,
-            sampling_rate=sample_rate,
-            min_speech_duration_ms=min_speech_duration_ms,
-            min_silence_duration_ms=min_silence_duration_ms
-        )
-        
-        logger.info(f"检测到 {len(speech_timestamps)} 个语音片段")
-        
-        # 转换时间戳为列表格式
-        result = []
-        total_speech_duration = 0
-        for ts in speech_timestamps:
-            duration = ts['end'] - ts['start']
-            total_speech_duration += duration
-            result.append({
-                "start": float(ts['start']),
-                "end": float(ts['end']),
-                "duration": float(duration)
-            })
-        
-        # 计算统计信息
-        audio_duration = waveform.shape[1] / sample_rate
-        speech_ratio = total_speech_duration / audio_duration if audio_duration > 0 else 0
-        
-        return JSONResponse(content={
-            "status": "success",
-            "speech_segments": result,
-            "statistics": {
-                "total_segments": len(result),
-                "total_speech_duration": round(total_speech_duration, 3),
-                "total_audio_duration": round(audio_duration, 3),
-                "speech_ratio": round(speech_ratio, 3),
-                "sample_rate": sample_rate,
-                "threshold_used": threshold
-            }
-        })
-        
+
+        return await detect_from_bytes(contents, threshold,
+                                       min_speech_duration_ms, min_silence_duration_ms,
+                                       segment_format=format)
+
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"处理音频时出错: {e}")
         raise HTTPException(status_code=500, detail=f"音频处理失败: {str(e)}")
-    finally:
-        # 清理临时文件
-        if temp_path and os.path.exists(temp_path):
-            try:
-                os.unlink(temp_path)
-                logger.info("临时文件已清理")
-            except Exception as e:
-                logger.warning(f"清理临时文件失败: {e}")
+
+@app.post("/detect_raw")
+async def detect_speech_raw(
+    request: Request,
+    threshold: Optional[float] = Query(0.5, ge=0.0, le=1.0, description="语音检测阈值 (0.0-1.0)"),
+    min_speech_duration_ms: Optional[int] = Query(250, ge=0, description="最小语音持续时间(毫秒)"),
+    min_silence_duration_ms: Optional[int] = Query(100, ge=0, description="最小静音持续时间(毫秒)"),
+    format: Optional[str] = Query("aos", description="返回格式：aos=片段字典列表，soa=列式数组")
+):
+    """
+    检测音频中的语音活动（原始请求体版本）
+
+    与 /detect 功能相同，但音频直接放在请求体中（如 Content-Type: audio/wav），
+    客户端可以流式发送文件句柄，省去 multipart 编码和整文件读入内存的开销。
+    """
+    try:
+        if not load_model():
+            raise HTTPException(status_code=503, detail="模型加载失败")
+
+        # 按块读取请求体，边收边写入内存缓冲
+        buffer = io.BytesIO()
+        async for chunk in request.stream():
+            buffer.write(chunk)
+        contents = buffer.getvalue()
+
+        return await detect_from_bytes(contents, threshold,
+                                       min_speech_duration_ms, min_silence_duration_ms,
+                                       segment_format=format)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"处理音频时出错: {e}")
+        raise HTTPException(status_code=500, detail=f"音频处理失败: {str(e)}")
+
+async def detect_from_bytes(contents, threshold, min_speech_duration_ms,
+                            min_silence_duration_ms, segment_format="aos"):
+    """对内存中的音频字节执行 VAD 检测，/detect 和 /detect_raw 共用"""
+    logger.info(f"音频文件大小: {len(contents)} bytes")
+
+    if len(contents) == 0:
+        raise HTTPException(status_code=400, detail="音频文件为空")
+
+    logger.info("开始处理音频...")
+
+    sample_rate = TARGET_SAMPLE_RATE
+    cache_key = hashlib.blake2b(contents, digest_size=16).hexdigest()
+    cached = _probs_cache_get(cache_key)
+
+    if cached is not None:
+        # 命中缓存：同一音频换阈值重查，只需重做阈值后处理
+        speech_probs, num_samples = cached
+        logger.info("命中概率缓存，跳过解码与模型前向")
+    else:
+        # 解码/重采样是纯 CPU 工作，下放到线程池，避免阻塞事件循环
+        waveform, orig_sample_rate = await asyncio.to_thread(
+            torchaudio.load, io.BytesIO(contents))
+        logger.info(f"音频参数: sample_rate={orig_sample_rate}, shape={waveform.shape}, duration={waveform.shape[1]/orig_sample_rate:.2f}s")
+
+        # 统一重采样到 16kHz，之后模型只处理固定采样率
+        waveform = await asyncio.to_thread(resample_to_target, waveform, orig_sample_rate)
+
+        # 转为单声道 1-D 波形，批处理和模型前向都按 1-D 处理
+        if waveform.dim() > 1:
+            waveform = waveform.mean(dim=0) if waveform.shape[0] > 1 else waveform[0]
+        num_samples = waveform.shape[0]
+
+        if _batch_queue is not None:
+            # 入队等待批处理协程返回帧级概率，再在本协程做阈值后处理
+            future = asyncio.get_running_loop().create_future()
+            await _batch_queue.put((waveform, future))
+            speech_probs = await future
+        else:
+            # 单请求也走 audio_forward：一次前向算完所有帧，
+            # 避免 get_speech_timestamps 内部逐帧调用模型的 Python 开销
+            speech_probs = (await asyncio.to_thread(_forward_batch, [waveform]))[0]
+            speech_probs = speech_probs[:(num_samples + WINDOW_SIZE - 1) // WINDOW_SIZE]
+
+        speech_probs = np.ascontiguousarray(speech_probs, dtype=np.float32)
+        _probs_cache_put(cache_key, (speech_probs, num_samples))
+
+    speech_timestamps = probs_to_timestamps(
+        speech_probs, num_samples, threshold,
+        min_speech_duration_ms, min_silence_duration_ms
+    )
+
+    logger.info(f"检测到 {len(speech_timestamps)} 个语音片段")
+
+    # 列式整理时间戳：样本数 -> 秒，统计量用向量运算一次算完
+    arr = np.fromiter(
+        (v for ts in speech_timestamps for v in (ts['start'], ts['end'])),
+        dtype=np.int64
+    ).reshape(-1, 2)
+    starts = arr[:, 0] / sample_rate
+    ends = arr[:, 1] / sample_rate
+    durations = ends - starts
+
+    if segment_format == "soa":
+        # 列式布局：键只出现一次，序列化/解析开销与片段数量无关
+        result = {
+            "starts": starts.tolist(),
+            "ends": ends.tolist(),
+            "durations": durations.tolist()
+        }
+    else:
+        result = [
+            {"start": s, "end": e, "duration": d}
+            for s, e, d in zip(starts.tolist(), ends.tolist(), durations.tolist())
+        ]
+
+    # 计算统计信息
+    total_speech_duration = float(durations.sum())
+    audio_duration = num_samples / sample_rate
+    speech_ratio = total_speech_duration / audio_duration if audio_duration > 0 else 0
+
+    return VADResponse(content={
+        "status": "success",
+        "cached": cached is not None,
+        "speech_segments": result,
+        "statistics": {
+            "total_segments": len(arr),
+            "total_speech_duration": round(total_speech_duration, 3),
+            "total_audio_duration": round(audio_duration, 3),
+            "speech_ratio": round(speech_ratio, 3),
+            "sample_rate": sample_rate,
+            "threshold_used": threshold
+        }
+    })
 
 @app.get("/info")
 async def get_model_info():
@@ -182,6 +570,7 @@ async def get_model_info():
         "model_name": "Silero VAD",
         "model_loaded": model_loaded,
         "supported_sample_rates": [8000, 16000],
+        "preferred_sample_rate": TARGET_SAMPLE_RATE,
         "supported_formats": ["wav", "mp3", "flac"],
         "default_threshold": 0.5,
         "description": "基于深度学习的语音活动检测模型"
@@ -189,4 +578,6 @@ async def get_model_info():
 
 if __name__ == "__main__":
     logger.info("启动 VAD 服务...")
-    uvicorn.run(app, host="127.0.0.1", port=8000) 
\ No newline at end of file
+    # VAD_WORKERS>1 时 uvicorn 以多进程方式启动，每个 worker 各自预加载模型
+    workers = int(os.environ.get("VAD_WORKERS", "1"))
+    uvicorn.run("vad_server:app", host="127.0.0.1", port=8000, workers=workers)
\ No newline at end of file
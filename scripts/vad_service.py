@@ -1,16 +1,25 @@
 import torch
 import torchaudio
-import numpy as np
+import soundfile as sf
 from flask import Flask, request, jsonify
 import io
-import wave
 
 app = Flask(__name__)
 
-# 加载 Silero VAD 模型
-model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
-                            model='silero_vad',
-                            force_reload=True)
+# 纯推理服务，全局关闭梯度跟踪
+torch.set_grad_enabled(False)
+
+# 加载 Silero VAD 模型（优先使用本地缓存，避免每次启动重新下载权重）
+try:
+    model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
+                                model='silero_vad',
+                                source='github',
+                                force_reload=False)
+except Exception:
+    # 本地缓存损坏等情况，回退到强制重新下载
+    model, utils = torch.hub.load(repo_or_dir='snakers4/silero-vad',
+                                model='silero_vad',
+                                force_reload=True)
 
 (get_speech_timestamps,
  save_audio,
@@ -24,21 +33,24 @@ def process_audio():
         # 获取音频数据
         audio_data = request.get_data()
         
-        # 将音频数据转换为 numpy 数组
-        with io.BytesIO(audio_data) as wav_io:
-            with wave.open(wav_io, 'rb') as wav:
-                audio = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
-                sample_rate = wav.getframerate()
-        
-        # 转换为 torch tensor
-        audio_tensor = torch.from_numpy(audio).float()
+        # libsndfile 一次遍历完成 PCM 解码和到 [-1,1] 的 float32 归一化
+        audio_np, sample_rate = sf.read(io.BytesIO(audio_data),
+                                        dtype='float32', always_2d=False)
+
+        # 多声道时取均值混为单声道
+        if audio_np.ndim > 1:
+            audio_np = audio_np.mean(axis=1)
+
+        # 转换为 torch tensor（零拷贝）
+        audio_tensor = torch.from_numpy(audio_np)
         
         # 获取语音时间戳
-        speech_timestamps = get_speech_timestamps(audio_tensor, model, 
-                                                sampling_rate=sample_rate,
-                                                threshold=0.5,
-                                                min_speech_duration_ms=250,
-                                                min_silence_duration_ms=100)
+        with torch.inference_mode():
+            speech_timestamps = get_speech_timestamps(audio_tensor, model,
+                                                    sampling_rate=sample_rate,
+                                                    threshold=0.5,
+                                                    min_speech_duration_ms=250,
+                                                    min_silence_duration_ms=100)
         
         # 转换时间戳为毫秒
         timestamps = []
@@ -54,4 +66,6 @@ def process_audio():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001) 
\ No newline at end of file
+    # 仅供本地调试；生产环境请用多线程 WSGI 服务器，例如：
+    #   gunicorn -k gthread --threads 8 -w $(nproc) vad_service:app -b 0.0.0.0:5001
+    app.run(host='0.0.0.0', port=5001, threaded=True)
\ No newline at end of file